@@ -8,6 +8,17 @@ import re
 import os
 from urllib.parse import unquote
 
+# Numbered audio span in index.html
+_TITLE_RE = re.compile(
+    r'<span style="white-space: nowrap;">(?P<num>\d+)<audio controls preload="none">'
+    r'<source src="(?P<url>https://s3-us-west-1\.amazonaws\.com/randombmir/[^"]+\.mp3)" type="audio/mpeg">'
+)
+
+def _s3_url(filename_only):
+    """Construct the S3 URL for an audio file, picking the category from its filename."""
+    category = 'long+talks' if filename_only.startswith(('01+', '02+')) else 'random'
+    return f"https://s3-us-west-1.amazonaws.com/randombmir/{category}/{filename_only}"
+
 def apply_existing_titles():
     """Apply titles from JSON to HTML file."""
     
@@ -15,24 +26,16 @@ def apply_existing_titles():
     with open('transcriptions.json', 'r', encoding='utf-8') as f:
         data = json.load(f)
     
-    # Create URL to title mapping
-    url_to_title = {}
-    for filename, info in data.items():
-        # Extract URL from audio_path or construct it
-        audio_path = info.get('audio_path', '')
-        if audio_path:
-            # Extract filename and construct S3 URL
-            filename_only = os.path.basename(audio_path)
-            # Determine category from filename pattern
-            if filename_only.startswith('01+') or filename_only.startswith('02+'):
-                category = 'long+talks'
-            elif filename_only.startswith('01+') or filename_only.startswith('02+'):
-                category = 'random'
-            else:
-                category = 'random'  # default
-            
-            s3_url = f"https://s3-us-west-1.amazonaws.com/randombmir/{category}/{filename_only}"
-            url_to_title[s3_url] = filename_only.replace('+', ' ').replace('.mp3', '').title()
+    # Create URL to title mapping in one pass over the JSON
+    filenames = (
+        os.path.basename(info['audio_path'])
+        for info in data.values()
+        if info.get('audio_path')
+    )
+    url_to_title = {
+        _s3_url(filename_only): filename_only.replace('+', ' ').replace('.mp3', '').title()
+        for filename_only in filenames
+    }
     
     print(f"📊 Found {len(url_to_title)} titles to apply")
     
@@ -47,18 +50,20 @@ def apply_existing_titles():
         print("💾 Created backup: index.html.backup")
     
     # Apply titles
-    updated_content = content
     applied_count = 0
     
-    for url, title in url_to_title.items():
-        # Handle audio tags with source elements
-        pattern = f'<span style="white-space: nowrap;">(\\d+)<audio controls preload="none"><source src="{re.escape(url)}" type="audio/mpeg">'
-        replacement = f'<span style="white-space: nowrap;">\\1. {title}<audio controls preload="none"><source src="{url}" type="audio/mpeg">'
-        
-        if re.search(pattern, updated_content):
-            updated_content = re.sub(pattern, replacement, updated_content)
-            applied_count += 1
-            print(f"✅ Applied: {title}")
+    def replace_title(match):
+        nonlocal applied_count
+        url = match.group('url')
+        title = url_to_title.get(url)
+        if title is None:
+            return match.group(0)
+        applied_count += 1
+        print(f"✅ Applied: {title}")
+        return f'<span style="white-space: nowrap;">{match.group("num")}. {title}<audio controls preload="none"><source src="{url}" type="audio/mpeg">'
+    
+    # Single pass over the HTML, looking each URL up in the title map
+    updated_content = _TITLE_RE.sub(replace_title, content)
     
     # Write updated content
     with open('index.html', 'w', encoding='utf-8') as f:
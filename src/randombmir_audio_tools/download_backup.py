@@ -4,31 +4,64 @@ Audio Backup Download Script
 Downloads all audio files from S3 URLs in HTML files to local disk for backup purposes.
 """
 
+import concurrent.futures
 import hashlib
+import json
+import mmap
 import os
 import re
+import shutil
+import threading
 import time
 from pathlib import Path
 from typing import Dict, List
 from urllib.parse import unquote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Audio URLs in source tags and data-audio attributes, compiled once at import
+# time. A bytes pattern so it can scan an mmap of the HTML file directly.
+_URL_RE = re.compile(rb'(?:src|data-audio)="(https://s3-us-west-1\.amazonaws\.com/randombmir/[^"]+\.mp3)"')
+
+# Size units used by format_size, 1024 apart
+_UNITS = ("B", "KB", "MB", "GB")
 
 class AudioBackupDownloader:
-    def __init__(self, backup_dir: str = "audio_backup"):
+    def __init__(self, backup_dir: str = "audio_backup", max_workers: int = 8):
         """
         Initialize the backup downloader.
         
         Args:
             backup_dir: Directory to store downloaded audio files
+            max_workers: Number of concurrent downloads
         """
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(exist_ok=True)
         
         # Create subdirectories to match S3 structure
         self.categories = ['long+talks', 'random', 'camps+and+arts', 'warnings']
-        for category in self.categories:
-            (self.backup_dir / category).mkdir(exist_ok=True)
+        self.category_dirs = {
+            category: self.backup_dir / category for category in self.categories
+        }
+        for category_dir in self.category_dirs.values():
+            category_dir.mkdir(exist_ok=True)
+        
+        # Sizes of files already on disk, listed once per category instead of
+        # stat()ing every URL
+        self._existing = {
+            category: {
+                entry.name: entry.stat().st_size
+                for entry in os.scandir(category_dir)
+                if entry.is_file()
+            }
+            for category, category_dir in self.category_dirs.items()
+        }
+        
+        # URLs extracted from each HTML file, keyed by file content hash
+        self._url_cache_file = self.backup_dir / "url_extract_cache.json"
+        self._url_cache = self._load_url_cache()
         
         # Track download statistics
         self.stats = {
@@ -38,6 +71,17 @@ class AudioBackupDownloader:
             'failed': 0,
             'total_size': 0
         }
+        self._stats_lock = threading.Lock()
+        
+        # Shared keep-alive session so worker threads reuse connections to S3
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("https://", adapter)
+        self.max_workers = max_workers
         
     def extract_audio_urls_from_html(self, html_file: str) -> List[str]:
         """
@@ -49,21 +93,42 @@ class AudioBackupDownloader:
         Returns:
             List of audio URLs
         """
-        with open(html_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Find all audio URLs (both in source tags and data-audio attributes)
-        audio_patterns = [
-            r'src="(https://s3-us-west-1\.amazonaws\.com/randombmir/[^"]+\.mp3)"',
-            r'data-audio="(https://s3-us-west-1\.amazonaws\.com/randombmir/[^"]+\.mp3)"'
-        ]
+        with open(html_file, 'rb') as f:
+            # mmap cannot map an empty file
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Reuse the previous scan if the file hasn't changed
+                digest = hashlib.blake2b(mm, digest_size=16).hexdigest()
+                cached = self._url_cache.get(html_file)
+                if cached and cached.get('hash') == digest:
+                    return list(cached['urls'])
+                
+                # Find all audio URLs (both in source tags and data-audio attributes)
+                urls = sorted({url.decode('utf-8') for url in _URL_RE.findall(mm)})
         
-        urls = set()
-        for pattern in audio_patterns:
-            matches = re.findall(pattern, content)
-            urls.update(matches)
+        self._url_cache[html_file] = {'hash': digest, 'urls': urls}
+        self._save_url_cache()
+        return urls
+    
+    def _load_url_cache(self) -> Dict:
+        """
+        Load cached URL extraction results.
         
-        return sorted(list(urls))
+        Returns:
+            Dictionary mapping HTML filenames to their content hash and URLs
+        """
+        try:
+            with open(self._url_cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_url_cache(self):
+        """Save cached URL extraction results."""
+        with open(self._url_cache_file, 'w', encoding='utf-8') as f:
+            json.dump(self._url_cache, f, indent=2)
     
     def get_file_info(self, url: str) -> Dict:
         """
@@ -75,14 +140,16 @@ class AudioBackupDownloader:
         Returns:
             Dictionary with file info
         """
-        filename = unquote(url.split('/')[-1])
-        category = url.split('/')[-2] if len(url.split('/')) > 1 else 'unknown'
+        parts = url.rsplit('/', 2)
+        filename = unquote(parts[-1])
+        category = parts[-2] if len(parts) >= 2 else 'unknown'
+        category_dir = self.category_dirs.get(category) or self.backup_dir / category
         
         return {
             'url': url,
             'filename': filename,
             'category': category,
-            'local_path': self.backup_dir / category / filename
+            'local_path': category_dir / filename
         }
     
     def calculate_file_hash(self, file_path: Path) -> str:
@@ -95,11 +162,30 @@ class AudioBackupDownloader:
         Returns:
             MD5 hash string
         """
-        hash_md5 = hashlib.md5()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            # Python 3.11+ hashes the whole file in C
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, "md5").hexdigest()
+            
+            # Older Pythons: hash a read-only mapping in one update call
+            if os.fstat(f.fileno()).st_size == 0:
+                return hashlib.md5().hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.md5(mm).hexdigest()
+    
+    def _remote_size(self, url: str) -> int:
+        """
+        Get the size of a remote file with a HEAD request.
+        
+        Args:
+            url: Audio file URL
+            
+        Returns:
+            Content-Length in bytes, or 0 if the server didn't send one
+        """
+        response = self.session.head(url, allow_redirects=True, timeout=10)
+        response.raise_for_status()
+        return int(response.headers.get('content-length', 0))
     
     def download_file(self, file_info: Dict) -> bool:
         """
@@ -115,57 +201,79 @@ class AudioBackupDownloader:
         filename = file_info['filename']
         local_path = file_info['local_path']
         
-        # Check if file already exists
-        if local_path.exists():
-            file_size = local_path.stat().st_size
-            print(f"✓ Skipped (exists): {filename} ({self.format_size(file_size)})")
-            self.stats['skipped'] += 1
-            self.stats['total_size'] += file_size
-            return True
+        # Check if file already exists and matches the remote size
+        file_size = self._existing.get(file_info['category'], {}).get(filename)
+        if file_size is not None:
+            try:
+                remote_size = self._remote_size(url)
+            except Exception as e:
+                # Can't verify; keep the local copy as before
+                print(f"⚠️  Could not check remote size for {filename}: {e}")
+                remote_size = 0
+            
+            if remote_size == 0 or remote_size == file_size:
+                print(f"✓ Skipped (exists): {filename} ({self.format_size(file_size)})")
+                with self._stats_lock:
+                    self.stats['skipped'] += 1
+                    self.stats['total_size'] += file_size
+                return True
+            
+            print(f"⚠️  Local size differs from remote for {filename}, re-downloading")
+        
+        # Resume from a partial download left by an earlier run
+        part_path = local_path.with_name(filename + '.part')
+        offset = self._existing.get(file_info['category'], {}).get(part_path.name, 0)
         
-        print(f"⬇️  Downloading: {filename}")
+        if offset:
+            print(f"⬇️  Resuming: {filename} from {self.format_size(offset)}")
+        else:
+            print(f"⬇️  Downloading: {filename}")
         
         try:
-            # Download with progress tracking
-            response = requests.get(url, stream=True)
+            headers = {'Range': f'bytes={offset}-'} if offset else {}
+            response = self.session.get(url, headers=headers, stream=True, timeout=(5, 60))
+            if response.status_code == 416:
+                # Range not satisfiable: the partial file is no shorter than the remote one, so start over
+                response.close()
+                offset = 0
+                response = self.session.get(url, stream=True, timeout=(5, 60))
             response.raise_for_status()
             
-            # Get file size for progress tracking
-            total_size = int(response.headers.get('content-length', 0))
+            # Server ignored the Range header and is sending the whole file
+            if response.status_code != 206:
+                offset = 0
             
-            with open(local_path, 'wb') as f:
-                downloaded = 0
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        # Show progress for large files
-                        if total_size > 1024 * 1024:  # > 1MB
-                            progress = (downloaded / total_size) * 100
-                            print(f"\r  Progress: {progress:.1f}%", end='', flush=True)
+            # Expected size for verification
+            content_length = int(response.headers.get('content-length', 0))
+            total_size = offset + content_length if content_length else 0
             
-            if total_size > 1024 * 1024:
-                print()  # New line after progress
+            # Copy the raw stream in large blocks instead of a per-chunk Python loop
+            response.raw.decode_content = True
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=131072)
+                actual_size = f.tell()
             
-            # Verify download
-            actual_size = local_path.stat().st_size
+            # Verify download; a short file stays as .part to resume next run
             if total_size > 0 and actual_size != total_size:
                 print(f"⚠️  Warning: Size mismatch for {filename}")
-                local_path.unlink()  # Delete incomplete file
+                if actual_size > total_size:
+                    part_path.unlink()
                 return False
             
+            part_path.replace(local_path)
+            
             print(f"✓ Downloaded: {filename} ({self.format_size(actual_size)})")
-            self.stats['downloaded'] += 1
-            self.stats['total_size'] += actual_size
+            with self._stats_lock:
+                self.stats['downloaded'] += 1
+                self.stats['total_size'] += actual_size
+                self._existing.setdefault(file_info['category'], {})[filename] = actual_size
             return True
             
         except Exception as e:
+            # Keep any partial .part file so the next run can resume it
             print(f"✗ Failed: {filename} - {e}")
-            # Clean up partial download
-            if local_path.exists():
-                local_path.unlink()
-            self.stats['failed'] += 1
+            with self._stats_lock:
+                self.stats['failed'] += 1
             return False
     
     def format_size(self, size_bytes: int) -> str:
@@ -181,13 +289,9 @@ class AudioBackupDownloader:
         if size_bytes == 0:
             return "0B"
         
-        size_names = ["B", "KB", "MB", "GB"]
-        i = 0
-        while size_bytes >= 1024 and i < len(size_names) - 1:
-            size_bytes /= 1024.0
-            i += 1
-        
-        return f"{size_bytes:.1f}{size_names[i]}"
+        # Each unit step is 10 bits, so the bit length gives the unit directly
+        i = min((int(size_bytes).bit_length() - 1) // 10, len(_UNITS) - 1)
+        return f"{size_bytes / (1 << (10 * i)):.1f}{_UNITS[i]}"
     
     def process_html_files(self, html_files: List[str]):
         """
@@ -219,16 +323,15 @@ class AudioBackupDownloader:
         print(f"\n📊 Total unique audio files: {len(all_urls)}")
         print("=" * 50)
         
-        # Download all files
-        for i, url in enumerate(all_urls, 1):
-            file_info = self.get_file_info(url)
-            print(f"\n[{i}/{len(all_urls)}] ", end='')
-            
-            success = self.download_file(file_info)
-            
-            # Rate limiting to be nice to the server
-            if success:
-                time.sleep(0.1)  # 100ms delay between successful downloads
+        # Download all files concurrently; worker count bounds the load on S3
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.download_file, self.get_file_info(url)): url
+                for url in all_urls
+            }
+            for i, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                future.result()
+                print(f"[{i}/{len(all_urls)}] done")
         
         # Print summary
         self.print_summary()
@@ -265,16 +368,16 @@ class AudioBackupDownloader:
             f.write(f"Total size: {self.format_size(self.stats['total_size'])}\n\n")
             
             # List all files by category
-            for category in self.categories:
-                category_dir = self.backup_dir / category
+            for category, category_dir in self.category_dirs.items():
                 if category_dir.exists():
-                    files = list(category_dir.glob("*.mp3"))
+                    # DirEntry caches stat results from the directory read
+                    files = [e for e in os.scandir(category_dir) if e.name.endswith(".mp3")]
                     if files:
                         f.write(f"\n{category.upper()}:\n")
                         f.write("-" * 30 + "\n")
-                        for file_path in sorted(files):
-                            size = file_path.stat().st_size
-                            f.write(f"{file_path.name} ({self.format_size(size)})\n")
+                        for entry in sorted(files, key=lambda e: e.name):
+                            size = entry.stat().st_size
+                            f.write(f"{entry.name} ({self.format_size(size)})\n")
         
         print(f"📋 Manifest created: {manifest_file}")
 
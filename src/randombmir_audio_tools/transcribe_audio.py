@@ -4,35 +4,74 @@ Audio Transcription Script
 Transcribes audio files using OpenAI's Whisper API and generates descriptive titles.
 """
 
+import asyncio
+import hashlib
+import itertools
 import json
+import mmap
 import os
 import re
-import time
+import shelve
+import shutil
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from urllib.parse import unquote
 
 import openai
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Chat model used for titles, and transcripts sent to it per batched completion
+TITLE_MODEL = "gpt-4o-mini"
+TITLE_BATCH_SIZE = 20
+
+# Audio URLs in source tags and data-audio attributes, compiled once at import
+# time. A bytes pattern so it can scan an mmap of the HTML file directly.
+_URL_RE = re.compile(rb'(?:src|data-audio)="(https://s3-us-west-1\.amazonaws\.com/randombmir/[^"]+\.mp3)"')
+
 class AudioTranscriber:
-    def __init__(self, api_key: str, output_dir: str = "audio_files"):
+    def __init__(self, api_key: str, output_dir: str = "audio_files", max_concurrency: int = 8):
         """
         Initialize the audio transcriber.
         
         Args:
             api_key: OpenAI API key
             output_dir: Directory to store downloaded audio files
+            max_concurrency: Maximum number of files processed at once
         """
         self.api_key = api_key
         self.client = openai.OpenAI(api_key=api_key)
+        # Async client for Whisper uploads; created lazily for the running
+        # event loop by _get_aclient
+        self.aclient: Optional[openai.AsyncOpenAI] = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.max_concurrency = max_concurrency
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
+        # Keep-alive session so downloads reuse the S3 connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("https://", adapter)
+        
+        # URLs extracted from each HTML file, keyed by file content hash
+        self._url_cache_file = self.output_dir / "url_extract_cache.json"
+        self._url_cache = self._load_url_cache()
+        
+        # Generated titles keyed by transcript preview hash and filename: an
+        # in-memory dict in front of a shelf so reruns skip the API entirely
+        self._title_cache_path = str(self.output_dir / "title_cache.db")
+        self._title_memo: Dict[str, str] = {}
+        
         # Store transcriptions
         self.transcriptions = {}
         
@@ -72,21 +111,42 @@ class AudioTranscriber:
         Returns:
             List of audio URLs
         """
-        with open(html_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Find all audio URLs (both in source tags and data-audio attributes)
-        audio_patterns = [
-            r'src="(https://s3-us-west-1\.amazonaws\.com/randombmir/[^"]+\.mp3)"',
-            r'data-audio="(https://s3-us-west-1\.amazonaws\.com/randombmir/[^"]+\.mp3)"'
-        ]
-        
-        urls = set()
-        for pattern in audio_patterns:
-            matches = re.findall(pattern, content)
-            urls.update(matches)
+        with open(html_file, 'rb') as f:
+            # mmap cannot map an empty file
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Reuse the previous scan if the file hasn't changed
+                digest = hashlib.blake2b(mm, digest_size=16).hexdigest()
+                cached = self._url_cache.get(html_file)
+                if cached and cached.get('hash') == digest:
+                    return list(cached['urls'])
+                
+                # Find all audio URLs (both in source tags and data-audio attributes)
+                urls = sorted({url.decode('utf-8') for url in _URL_RE.findall(mm)})
+        
+        self._url_cache[html_file] = {'hash': digest, 'urls': urls}
+        self._save_url_cache()
+        return urls
+    
+    def _load_url_cache(self) -> Dict:
+        """
+        Load cached URL extraction results.
         
-        return sorted(list(urls))
+        Returns:
+            Dictionary mapping HTML filenames to their content hash and URLs
+        """
+        try:
+            with open(self._url_cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_url_cache(self):
+        """Save cached URL extraction results."""
+        with open(self._url_cache_file, 'w', encoding='utf-8') as f:
+            json.dump(self._url_cache, f, indent=2)
     
     def download_audio_file(self, url: str) -> Optional[Path]:
         """
@@ -109,13 +169,12 @@ class AudioTranscriber:
         print(f"⬇️  Downloading: {filename}")
         
         try:
-            response = requests.get(url, stream=True)
+            response = self.session.get(url, stream=True, timeout=(5, 60))
             response.raise_for_status()
             
+            response.raw.decode_content = True
             with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+                shutil.copyfileobj(response.raw, f, length=131072)
             
             print(f"✓ Downloaded: {filename}")
             return local_path
@@ -124,7 +183,52 @@ class AudioTranscriber:
             print(f"✗ Failed to download {filename}: {e}")
             return None
     
-    def transcribe_audio(self, audio_path: Path) -> Optional[str]:
+    async def _create_transcription(self, audio_path: Path, max_retries: int = 5) -> str:
+        """
+        Send an audio file to Whisper, backing off exponentially on rate limits,
+        server errors, timeouts and connection errors.
+        
+        Args:
+            audio_path: Path to audio file
+            max_retries: Attempts before the last error is re-raised
+            
+        Returns:
+            Transcription text
+        """
+        delay = 1
+        for attempt in range(max_retries):
+            try:
+                # httpx streams the open file and sends its Content-Length
+                with open(audio_path, 'rb') as audio_file:
+                    return await self._get_aclient().audio.transcriptions.create(
+                        model="whisper-1",
+                        file=(audio_path.name, audio_file, "audio/mpeg"),
+                        response_format="text"
+                    )
+            except (openai.RateLimitError, openai.InternalServerError,
+                    openai.APIConnectionError) as e:
+                if attempt == max_retries - 1:
+                    raise
+                print(f"⚠️  {type(e).__name__} on {audio_path.name}, retrying in {delay}s...")
+                await asyncio.sleep(delay)
+                delay *= 2
+    
+    def _get_aclient(self) -> openai.AsyncOpenAI:
+        """
+        Return the async OpenAI client, creating one for the running event loop.
+        
+        Returns:
+            Async OpenAI client bound to the current loop
+        """
+        loop = asyncio.get_running_loop()
+        if self.aclient is None or self._aclient_loop is not loop:
+            # _create_transcription does its own backoff, so the SDK's
+            # built-in retries would only stack on top of it
+            self.aclient = openai.AsyncOpenAI(api_key=self.api_key, max_retries=0)
+            self._aclient_loop = loop
+        return self.aclient
+    
+    async def transcribe_audio(self, audio_path: Path) -> Optional[str]:
         """
         Transcribe an audio file using OpenAI Whisper API.
         
@@ -146,17 +250,11 @@ class AudioTranscriber:
         print(f"🎤 Transcribing: {filename}")
         
         try:
-            with open(audio_path, 'rb') as audio_file:
-                response = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
-                transcript = response
+            transcript = await self._create_transcription(audio_path)
             
-            # Save individual transcription file
-            with open(transcript_path, 'w', encoding='utf-8') as f:
-                f.write(transcript)
+            # Save individual transcription file without blocking the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, transcript_path.write_text, transcript, 'utf-8')
             
             # Store transcription in memory
             self.transcriptions[filename] = {
@@ -168,9 +266,6 @@ class AudioTranscriber:
             print(f"✓ Transcribed: {filename}")
             print(f"📄 Saved transcript: {transcript_filename}")
             
-            # Rate limiting
-            time.sleep(1)
-            
             return transcript
             
         except openai.AuthenticationError as e:
@@ -178,8 +273,7 @@ class AudioTranscriber:
             print(f"   Please check your .env file and ensure OPENAI_API_KEY is correct")
             return None
         except openai.RateLimitError as e:
-            print(f"⚠️  Rate limit exceeded for {filename}. Waiting 60 seconds...")
-            time.sleep(60)
+            print(f"⚠️  Rate limit exceeded for {filename}, giving up after retries")
             return None
         except openai.APIError as e:
             print(f"⚠️  API Error for {filename}: {e}")
@@ -190,7 +284,7 @@ class AudioTranscriber:
     
     def generate_title_from_transcript(self, transcript: str, filename: str) -> str:
         """
-        Generate a descriptive title from transcript using GPT-3.5.
+        Generate a descriptive title from transcript using GPT-4o mini.
         
         Args:
             transcript: Audio transcription
@@ -199,36 +293,32 @@ class AudioTranscriber:
         Returns:
             Generated title
         """
-        # Truncate transcript for API efficiency
-        transcript_preview = transcript[:500] if len(transcript) > 500 else transcript
-        
-        prompt = f"""
-        Create a catchy, descriptive title (max 50 characters) for this BMIR audio excerpt:
-        
-        Transcript: "{transcript_preview}"
-        Original filename: {filename}
+        key = self._title_cache_key(transcript, filename)
+        cached = self._get_cached_titles([key]).get(key)
+        if cached is not None:
+            return cached
         
-        Make it engaging and descriptive of the content. Avoid generic titles.
-        """
+        # Truncate transcript for API efficiency
+        transcript_preview = transcript[:500]
         
         try:
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=TITLE_MODEL,
                 messages=[
-                    {"role": "system", "content": "You are a helpful assistant that creates engaging titles for audio content."},
-                    {"role": "user", "content": prompt}
+                    {
+                        "role": "system",
+                        "content": 'Title this BMIR audio excerpt in at most 50 characters. Reply as JSON: {"title": ...}'
+                    },
+                    {"role": "user", "content": f"Filename: {filename}\nTranscript: {transcript_preview}"}
                 ],
-                max_tokens=100,
-                temperature=0.7
+                response_format={"type": "json_object"},
+                max_tokens=30,
+                seed=0,
+                temperature=0
             )
             
-            title = response.choices[0].message.content.strip()
-            
-            # Clean up title
-            title = title.replace('"', '').replace("'", "")
-            if len(title) > 50:
-                title = title[:47] + "..."
-            
+            title = self._clean_title(json.loads(response.choices[0].message.content)["title"])
+            self._store_titles({key: title})
             return title
             
         except Exception as e:
@@ -236,6 +326,125 @@ class AudioTranscriber:
             # Fallback to filename-based title
             return filename.replace('+', ' ').replace('.mp3', '')
     
+    def generate_titles_batched(self, items: List[Tuple[str, str]]) -> Dict[str, str]:
+        """
+        Generate titles for several transcripts with a single chat completion.
+        
+        Args:
+            items: (filename, transcript) pairs
+            
+        Returns:
+            Dictionary mapping filenames to generated titles; files the model
+            skipped are missing from the result
+        """
+        keys = {filename: self._title_cache_key(transcript, filename) for filename, transcript in items}
+        cached = self._get_cached_titles(keys.values())
+        titles = {filename: cached[key] for filename, key in keys.items() if key in cached}
+        
+        payload = [
+            {"filename": filename, "transcript": transcript[:500]}
+            for filename, transcript in items
+            if filename not in titles
+        ]
+        if not payload:
+            return titles
+        
+        try:
+            response = self.client.chat.completions.create(
+                model=TITLE_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": (
+                            "You create catchy, descriptive titles (max 50 characters) for BMIR "
+                            "audio excerpts. Avoid generic titles. The user sends a JSON array of "
+                            "{filename, transcript} objects. Reply with a JSON object of the form "
+                            '{"titles": [{"filename": ..., "title": ...}]}, one entry per input.'
+                        )
+                    },
+                    {"role": "user", "content": json.dumps(payload, ensure_ascii=False)}
+                ],
+                response_format={"type": "json_object"},
+                max_tokens=60 * len(payload),
+                seed=0,
+                temperature=0
+            )
+            
+            data = json.loads(response.choices[0].message.content)
+            generated = {
+                entry["filename"]: self._clean_title(entry["title"])
+                for entry in data.get("titles", [])
+                if entry.get("filename") in keys and entry.get("title")
+            }
+            self._store_titles({keys[filename]: title for filename, title in generated.items()})
+            titles.update(generated)
+            
+        except Exception as e:
+            print(f"✗ Failed to generate batched titles: {e}")
+        
+        return titles
+    
+    def _title_cache_key(self, transcript: str, filename: str) -> str:
+        """
+        Build the title cache key for a transcript.
+        
+        Args:
+            transcript: Audio transcription
+            filename: Original filename
+            
+        Returns:
+            Hash of the transcript preview joined with the filename
+        """
+        preview_hash = hashlib.blake2b(transcript[:500].encode('utf-8'), digest_size=8).hexdigest()
+        return f"{preview_hash}:{filename}"
+    
+    def _get_cached_titles(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up previously generated titles, memory first, then the on-disk shelf.
+        
+        Args:
+            keys: Title cache keys
+            
+        Returns:
+            Dictionary mapping the keys that were found to their titles
+        """
+        found = {key: self._title_memo[key] for key in keys if key in self._title_memo}
+        missing = [key for key in keys if key not in found]
+        if missing:
+            with shelve.open(self._title_cache_path) as cache:
+                for key in missing:
+                    if key in cache:
+                        found[key] = self._title_memo[key] = cache[key]
+        return found
+    
+    def _store_titles(self, titles: Dict[str, str]):
+        """
+        Remember generated titles in memory and on disk.
+        
+        Args:
+            titles: Dictionary mapping title cache keys to titles
+        """
+        if not titles:
+            return
+        self._title_memo.update(titles)
+        with shelve.open(self._title_cache_path) as cache:
+            cache.update(titles)
+    
+    def _clean_title(self, title: str) -> str:
+        """
+        Strip quotes from a model-generated title and cap it at 50 characters.
+        
+        Args:
+            title: Raw title from the model
+            
+        Returns:
+            Cleaned title
+        """
+        title = title.strip().replace('"', '').replace("'", "")
+        if len(title) > 50:
+            title = title[:47] + "..."
+        return title
+    
     def process_html_file(self, html_file: str) -> Dict[str, str]:
         """
         Process a single HTML file: download, transcribe, and generate titles.
@@ -250,27 +459,84 @@ class AudioTranscriber:
         print("=" * 50)
         
         urls = self.extract_audio_urls_from_html(html_file)
+        transcribed = asyncio.run(self._process_urls(urls))
+        
+        # Title every transcript in batches rather than one request per file
+        titles = {}
+        pairs = iter(transcribed.values())
+        while True:
+            batch = list(itertools.islice(pairs, TITLE_BATCH_SIZE))
+            if not batch:
+                break
+            titles.update(self.generate_titles_batched(batch))
+        
         url_to_title = {}
+        for url, (filename, transcript) in transcribed.items():
+            title = titles.get(filename)
+            if title is None:
+                title = self.generate_title_from_transcript(transcript, filename)
+            url_to_title[url] = title
+            
+            print(f"📝 Title: {title}")
+            print("-" * 30)
+        
+        return url_to_title
+    
+    async def _process_urls(self, urls: List[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        Download and transcribe a batch of URLs concurrently.
         
-        for url in urls:
+        Args:
+            urls: Audio file URLs
+            
+        Returns:
+            Dictionary mapping URLs to (filename, transcript) pairs
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        aclient = self._get_aclient()
+        try:
+            results = await asyncio.gather(
+                *(self._process_url(url, semaphore) for url in urls),
+                return_exceptions=True
+            )
+        finally:
+            await aclient.close()
+            self.aclient = None
+            self._aclient_loop = None
+        
+        transcribed = {}
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                print(f"✗ Failed to process {url}: {result}")
+            elif result:
+                transcribed[url] = result
+        
+        return transcribed
+    
+    async def _process_url(self, url: str, semaphore: asyncio.Semaphore) -> Optional[Tuple[str, str]]:
+        """
+        Download and transcribe a single URL.
+        
+        Args:
+            url: Audio file URL
+            semaphore: Bounds how many files are in flight at once
+            
+        Returns:
+            (filename, transcript) pair or None if any step failed
+        """
+        async with semaphore:
             # Download audio
-            audio_path = self.download_audio_file(url)
+            loop = asyncio.get_running_loop()
+            audio_path = await loop.run_in_executor(None, self.download_audio_file, url)
             if not audio_path:
-                continue
+                return None
             
             # Transcribe audio
-            transcript = self.transcribe_audio(audio_path)
+            transcript = await self.transcribe_audio(audio_path)
             if not transcript:
-                continue
-            
-            # Generate title
-            title = self.generate_title_from_transcript(transcript, audio_path.name)
-            url_to_title[url] = title
-            
-            print(f"📝 Title: {title}")
-            print("-" * 30)
+                return None
         
-        return url_to_title
+        return audio_path.name, transcript
     
     def update_html_file(self, html_file: str, url_to_title: Dict[str, str]):
         """
@@ -292,23 +558,21 @@ class AudioTranscriber:
         with open(html_file, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Replace titles
+        # Replace titles in data-audio attributes; source tags are left as they are.
+        # subn both replaces and reports whether the URL was present, in one scan.
         updated_content = content
+        applied_count = 0
         for url, title in url_to_title.items():
-            # Replace in data-audio attributes
             pattern = f'data-audio="{re.escape(url)}">[^<]+</li>'
             replacement = f'data-audio="{url}">{title}</li>'
-            updated_content = re.sub(pattern, replacement, updated_content)
-            
-            # Replace in source tags
-            pattern = f'<source src="{re.escape(url)}" type="audio/mpeg">'
-            # Keep source tags as they are, just update the text content
+            updated_content, n = re.subn(pattern, lambda _, r=replacement: r, updated_content)
+            applied_count += n
         
         # Write updated content
         with open(html_file, 'w', encoding='utf-8') as f:
             f.write(updated_content)
         
-        print(f"✅ Updated: {html_file}")
+        print(f"✅ Updated: {html_file} ({applied_count} titles applied)")
     
     def save_transcriptions(self, output_file: str = "transcriptions.json"):
         """
@@ -5,46 +5,245 @@ Transcribes audio files using Faster-Whisper and generates titles using Ollama.
 """
 
 import argparse
+import asyncio
+import atexit
+import concurrent.futures
+import hashlib
+import io
 import json
+import mmap
 import os
+import queue
 import re
+import shutil
+import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import unquote
 
+import httpx
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
-from faster_whisper import WhisperModel
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 import ollama
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Concurrent S3 downloads; these are network-bound, so not tied to core count
+DOWNLOAD_WORKERS = 8
+
+# Items buffered between pipeline stages in process_urls, and the marker
+# each stage sends downstream when it has finished
+PIPELINE_QUEUE_SIZE = 4
+_STAGE_DONE = object()
+
+# Loaded Whisper models keyed by (model_size, compute_type, model_path, workers),
+# so repeated transcriber instances (e.g. in the test scripts) load a model once
+_WHISPER_MODELS: Dict[tuple, WhisperModel] = {}
+_WHISPER_LOCK = threading.Lock()
+
+# Audio URLs in source tags and data-audio attributes, compiled once at import
+# time. A bytes pattern so it can scan an mmap of the HTML file directly.
+_AUDIO_URL_RE = re.compile(rb'(?:src|data-audio)="(https://s3-us-west-1\.amazonaws\.com/randombmir/[^"]+\.mp3)"')
+
+# Phrases Ollama models use when refusing to write a title ("I cannot",
+# "I'm sorry", "I am not able", ...), matched case-insensitively in one pass
+_REFUSAL_RE = re.compile(r"i(?: can ?not| am (?:unable|sorry|not able)|'m (?:unable|sorry|not able))", re.I)
+
+
+class LLMCache:
+    """Disk-backed cache of LLM responses, keyed by a hash of the request."""
+    
+    def __init__(self, cache_file: str = "data/llm_cache.json"):
+        """
+        Initialize the cache, loading any existing entries.
+        
+        Args:
+            cache_file: JSON file holding cached responses
+        """
+        self.cache_file = Path(cache_file)
+        self._lock = threading.Lock()
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+    
+    @staticmethod
+    def make_key(model, prompt: str) -> str:
+        """
+        Build a cache key for a request.
+        
+        Args:
+            model: Model name (or list of models tried in order)
+            prompt: Prompt text
+            
+        Returns:
+            SHA-256 hex digest of the request
+        """
+        payload = json.dumps({"model": model, "prompt": prompt}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key from make_key
+            
+        Returns:
+            Cached response or None
+        """
+        with self._lock:
+            return self._entries.get(key)
+    
+    def set(self, key: str, value: str):
+        """
+        Store a response and write the cache to disk.
+        
+        Args:
+            key: Cache key from make_key
+            value: Response to cache
+        """
+        with self._lock:
+            self._entries[key] = value
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write a temp file and swap it in, so a crash mid-write can't
+            # leave a truncated cache that loads as empty
+            tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+
 
 class LocalAudioTranscriber:
-    def __init__(self, output_dir: str = "audio_files", model_size: str = "base"):
+    def __init__(self, output_dir: str = "audio_files", model_size: str = "base",
+                 compute_type: Optional[str] = None, model_path: Optional[str] = None,
+                 use_cache: bool = True, beam_size: int = 1):
         """
         Initialize the local audio transcriber.
         
         Args:
             output_dir: Directory to store downloaded audio files
             model_size: Whisper model size (tiny, base, small, medium, large)
+            compute_type: CTranslate2 compute type (defaults to $WHISPER_COMPUTE_TYPE or int8)
+            model_path: Directory of a pre-quantized CTranslate2 model
+                (defaults to $WHISPER_MODEL_PATH); overrides model_size
+            use_cache: Reuse cached Ollama titles for identical prompts
+            beam_size: Whisper beam width; 1 decodes greedily, which is plenty
+                for clips whose transcript only feeds a title prompt
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
-        # Initialize Whisper model
-        print(f"🤖 Loading Whisper model: {model_size}")
-        self.whisper_model = WhisperModel(model_size, device="cpu", compute_type="int8")
-        print("✅ Whisper model loaded successfully!")
-        
-        # Store transcriptions
+        # One worker per two cores; each worker runs its own Whisper inference
+        self.max_workers = max(1, (os.cpu_count() or 2) // 2)
+        
+        # Whisper model settings; the model itself is loaded on first use so
+        # the titles-only workflow never pays for it
+        self._whisper_config = (
+            model_size,
+            compute_type or os.getenv('WHISPER_COMPUTE_TYPE', 'int8'),
+            model_path or os.getenv('WHISPER_MODEL_PATH'),
+            self.max_workers
+        )
+        self._batched_model: Optional[BatchedInferencePipeline] = None
+        self.beam_size = beam_size
+        
+        # Keep-alive session for S3 downloads
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        ))
+        
+        # Ollama responses cached by prompt hash; None bypasses the cache
+        self.llm_cache = LLMCache() if use_cache else None
+        
+        # One event loop and keep-alive HTTP client for all Ollama calls,
+        # started on first use
+        self._ollama_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ollama_client: Optional[httpx.AsyncClient] = None
+        
+        # Store transcriptions; guarded by a lock since workers add to it
         self.transcriptions = {}
+        self._lock = threading.Lock()
+        
+        # .title files are written in the background so title generation
+        # doesn't wait on disk; pending writes are flushed at exit
+        self._io_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self._pending_io: Set[concurrent.futures.Future] = set()
+        self._io_lock = threading.Lock()
+        atexit.register(self._shutdown_io)
+        
+        # Human-edited titles, read from the .title files on first use
+        self._human_titles: Optional[Dict[str, str]] = None
+        
+        # Titles already returned this session, by audio filename
+        self._titled: Dict[str, str] = {}
         
         # HTML files to process
         self.html_files = ['index.html', 'inc.html', 'inc2.html', 'inx3.html']
     
+    @property
+    def whisper_model(self) -> WhisperModel:
+        """Whisper model, loaded once per process and shared by all instances."""
+        with _WHISPER_LOCK:
+            model = _WHISPER_MODELS.get(self._whisper_config)
+            if model is None:
+                model = self._load_whisper_model(*self._whisper_config[:3])
+                _WHISPER_MODELS[self._whisper_config] = model
+                print("✅ Whisper model loaded successfully!")
+            return model
+    
+    @property
+    def batched_model(self) -> BatchedInferencePipeline:
+        """Pipeline that batches the speech chunks of each file into shared forward passes."""
+        with self._lock:
+            if self._batched_model is None:
+                self._batched_model = BatchedInferencePipeline(model=self.whisper_model)
+            return self._batched_model
+    
+    def _load_whisper_model(self, model_size: str, compute_type: str,
+                            model_path: Optional[str]) -> WhisperModel:
+        """
+        Load the Whisper model, falling back to the stock int8 model if the
+        quantized model or compute type is unavailable.
+        
+        Args:
+            model_size: Whisper model size
+            compute_type: CTranslate2 compute type
+            model_path: Directory of a pre-quantized model, or None
+            
+        Returns:
+            Loaded Whisper model
+        """
+        if model_path and not Path(model_path).is_dir():
+            print(f"⚠️  Quantized model not found at {model_path}, using {model_size}")
+            model_path = None
+        
+        model = model_path or model_size
+        # Split the cores between the workers instead of giving each one
+        # CTranslate2's default thread pool
+        cpu_threads = max(1, (os.cpu_count() or 2) // self.max_workers)
+        print(f"🤖 Loading Whisper model: {model} ({compute_type})")
+        try:
+            return WhisperModel(model, device="cpu", compute_type=compute_type,
+                                cpu_threads=cpu_threads, num_workers=self.max_workers)
+        except (ValueError, RuntimeError) as e:
+            if compute_type == "int8" and not model_path:
+                raise
+            print(f"⚠️  Could not load {model} with {compute_type}: {e}")
+            print(f"🤖 Falling back to {model_size} (int8)")
+            return WhisperModel(model_size, device="cpu", compute_type="int8",
+                                cpu_threads=cpu_threads, num_workers=self.max_workers)
+    
     def extract_audio_urls_from_html(self, html_file: str) -> List[str]:
         """
         Extract all audio URLs from an HTML file.
@@ -55,19 +254,14 @@ class LocalAudioTranscriber:
         Returns:
             List of audio URLs
         """
-        with open(html_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Find all audio URLs (both in source tags and data-audio attributes)
-        audio_patterns = [
-            r'src="(https://s3-us-west-1\.amazonaws\.com/randombmir/[^"]+\.mp3)"',
-            r'data-audio="(https://s3-us-west-1\.amazonaws\.com/randombmir/[^"]+\.mp3)"'
-        ]
-        
-        urls = set()
-        for pattern in audio_patterns:
-            matches = re.findall(pattern, content)
-            urls.update(matches)
+        with open(html_file, 'rb') as f:
+            # mmap cannot map an empty file
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            
+            # Find all audio URLs (both in source tags and data-audio attributes)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                urls = {match.group(1).decode('utf-8') for match in _AUDIO_URL_RE.finditer(mm)}
         
         return sorted(list(urls))
     
@@ -92,13 +286,13 @@ class LocalAudioTranscriber:
         print(f"⬇️  Downloading: {filename}")
         
         try:
-            response = requests.get(url, stream=True)
+            response = self.session.get(url, stream=True, timeout=(5, 60))
             response.raise_for_status()
             
+            # Copy the raw stream in 1 MiB blocks, skipping requests' chunk iterator
+            response.raw.decode_content = True
             with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+                shutil.copyfileobj(response.raw, f, length=1 << 20)
             
             print(f"✓ Downloaded: {filename}")
             return local_path
@@ -120,6 +314,7 @@ class LocalAudioTranscriber:
         filename = audio_path.name
         transcript_filename = filename.replace('.mp3', '.txt')
         transcript_path = self.output_dir / transcript_filename
+        part_path = transcript_path.with_name(transcript_filename + '.part')
         
         # Check if already transcribed
         if filename in self.transcriptions:
@@ -129,26 +324,43 @@ class LocalAudioTranscriber:
         print(f"🎤 Transcribing: {filename}")
         
         try:
-            # Transcribe using Faster-Whisper
-            segments, info = self.whisper_model.transcribe(
+            # Transcribe using Faster-Whisper, batching the file's chunks
+            segments, info = self.batched_model.transcribe(
                 str(audio_path),
-                beam_size=5,
-                language="en"
+                batch_size=8,
+                beam_size=self.beam_size,
+                best_of=1,
+                temperature=0,
+                condition_on_previous_text=False,
+                language="en",
+                # Skip silence and music between speech so the decoder never
+                # sees it (already the batched pipeline's default, with its
+                # tighter 160 ms silence split)
+                vad_filter=True
             )
             
-            # Combine all segments into one transcript
-            transcript = " ".join([segment.text for segment in segments])
-            
-            # Save individual transcription file
-            with open(transcript_path, 'w', encoding='utf-8') as f:
-                f.write(transcript)
+            # Segments are decoded lazily, so write each one as it arrives
+            # rather than after the whole file. They go to a .part file that
+            # only replaces the transcript once decoding has finished.
+            buf = io.StringIO()
+            with open(part_path, 'w', encoding='utf-8') as f:
+                separator = ""
+                for segment in segments:
+                    f.write(separator)
+                    f.write(segment.text)
+                    buf.write(separator)
+                    buf.write(segment.text)
+                    separator = " "
+            os.replace(part_path, transcript_path)
+            transcript = buf.getvalue()
             
             # Store transcription in memory
-            self.transcriptions[filename] = {
-                'transcript': transcript,
-                'audio_path': str(audio_path),
-                'transcript_path': str(transcript_path)
-            }
+            with self._lock:
+                self.transcriptions[filename] = {
+                    'transcript': transcript,
+                    'audio_path': str(audio_path),
+                    'transcript_path': str(transcript_path)
+                }
             
             print(f"✓ Transcribed: {filename}")
             print(f"📄 Saved transcript: {transcript_filename}")
@@ -156,6 +368,8 @@ class LocalAudioTranscriber:
             return transcript
             
         except Exception as e:
+            # Don't leave a truncated transcript behind
+            part_path.unlink(missing_ok=True)
             print(f"✗ Failed to transcribe {filename}: {e}")
             return None
     
@@ -170,12 +384,37 @@ class LocalAudioTranscriber:
         Returns:
             Generated title
         """
+        # Files already titled this session skip the lookups and Ollama entirely
+        with self._lock:
+            title = self._titled.get(filename)
+        if title is not None:
+            return title
+        
+        title = self._generate_title(transcript, filename)
+        with self._lock:
+            self._titled[filename] = title
+        return title
+    
+    def _generate_title(self, transcript: str, filename: str) -> str:
+        """
+        Look up or generate the title for a file not yet titled this session.
+        
+        Args:
+            transcript: Audio transcription
+            filename: Original filename
+            
+        Returns:
+            Human-edited, cached, generated, or first-sentence title
+        """
         # First check if there's a human-edited title
-        human_titles = self.load_human_titles()
+        with self._lock:
+            if self._human_titles is None:
+                self._human_titles = self.load_human_titles()
+            human_titles = self._human_titles
         if filename in human_titles:
             print(f"✅ Using human-edited title for {filename}")
             # Always save the .title file for review
-            self.save_title_to_file(filename, human_titles[filename], transcript)
+            self._save_title_async(filename, human_titles[filename], transcript)
             return human_titles[filename]
         
         # Truncate transcript for API efficiency
@@ -200,46 +439,31 @@ class LocalAudioTranscriber:
             "codellama:7b"
         ]
         
-        for model in models_to_try:
-            try:
-                print(f"🤖 Trying model: {model}")
-                
-                response = requests.post(
-                    "http://localhost:11434/api/generate",
-                    json={
-                        "model": model,
-                        "prompt": prompt,
-                        "stream": False
-                    },
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    title = result['response'].strip()
-                    
-                    # Check if the model refused to generate content
-                    if any(phrase in title.lower() for phrase in [
-                        "i can not", "i cannot", "i'm unable", "i am unable", 
-                        "i'm sorry", "i am sorry", "i cannot create",
-                        "i can not create", "i'm not able", "i am not able"
-                    ]):
-                        print(f"⚠️  Model {model} refused to generate title")
-                        continue
-                    
-                    # Clean up title
-                    title = title.replace('"', '').replace("'", "")
-                    if len(title) > 50:
-                        title = title[:47] + "..."
-                    
-                    print(f"✅ Generated title with {model}: {title}")
-                    # Always save the .title file for review
-                    self.save_title_to_file(filename, title, transcript)
-                    return title
-                    
-            except Exception as e:
-                print(f"⚠️  Failed with model {model}: {e}")
-                continue
+        # Reuse the title from an earlier run with the same prompt
+        cache_key = LLMCache.make_key(models_to_try, prompt)
+        cached_title = self.llm_cache.get(cache_key) if self.llm_cache is not None else None
+        if cached_title is not None:
+            print(f"✅ Using cached title for {filename}: {cached_title}")
+            # Always save the .title file for review
+            self._save_title_async(filename, cached_title, transcript)
+            return cached_title
+        
+        # Race the models two at a time and take the first usable title
+        result = self._run_ollama(self._race_models(prompt, models_to_try))
+        if result is not None:
+            model, title = result
+            
+            # Clean up title
+            title = title.replace('"', '').replace("'", "")
+            if len(title) > 50:
+                title = title[:47] + "..."
+            
+            print(f"✅ Generated title with {model}: {title}")
+            if self.llm_cache is not None:
+                self.llm_cache.set(cache_key, title)
+            # Always save the .title file for review
+            self._save_title_async(filename, title, transcript)
+            return title
         
         # If all models fail, use first sentence from transcript as fallback
         print(f"⚠️  All models failed for {filename}, using first sentence as title")
@@ -248,10 +472,112 @@ class LocalAudioTranscriber:
         first_sentence = self.extract_first_sentence(transcript)
         
         # Always save the .title file for review
-        self.save_title_to_file(filename, first_sentence, transcript)
+        self._save_title_async(filename, first_sentence, transcript)
         
         return first_sentence
     
+    async def _race_models(self, prompt: str, models: List[str]) -> Optional[Tuple[str, str]]:
+        """
+        Query Ollama models concurrently in pairs, in order of preference.
+        
+        The first non-refusal response in a pair wins and the other request is
+        cancelled; the next pair is only tried if both fail.
+        
+        Args:
+            prompt: Prompt to send
+            models: Model names in order of preference
+            
+        Returns:
+            (model, title) from the winning model, or None if all failed
+        """
+        for i in range(0, len(models), 2):
+            tasks = [
+                asyncio.ensure_future(self._call_ollama(self._ollama_client, model, prompt))
+                for model in models[i:i + 2]
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    result = await next_done
+                    if result is not None:
+                        return result
+            finally:
+                for task in tasks:
+                    task.cancel()
+        return None
+    
+    def _run_ollama(self, coro):
+        """
+        Run a coroutine on the shared Ollama event loop and wait for its result.
+        
+        The loop runs on its own daemon thread, so callers on any thread reuse
+        the same client and its open connections.
+        
+        Args:
+            coro: Coroutine to run
+            
+        Returns:
+            The coroutine's result
+        """
+        with self._lock:
+            if self._ollama_loop is None:
+                self._ollama_loop = asyncio.new_event_loop()
+                self._ollama_client = httpx.AsyncClient(timeout=30)
+                threading.Thread(target=self._ollama_loop.run_forever, daemon=True).start()
+                atexit.register(self._close_ollama)
+        return asyncio.run_coroutine_threadsafe(coro, self._ollama_loop).result()
+    
+    def _close_ollama(self):
+        """
+        Close the shared Ollama client and stop its event loop.
+        """
+        with self._lock:
+            loop, self._ollama_loop = self._ollama_loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._ollama_client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+    
+    async def _call_ollama(self, client: httpx.AsyncClient, model: str,
+                           prompt: str) -> Optional[Tuple[str, str]]:
+        """
+        Ask a single Ollama model for a title.
+        
+        Args:
+            client: HTTP client for the Ollama server
+            model: Model name
+            prompt: Prompt to send
+            
+        Returns:
+            (model, title) or None if the request failed or the model refused
+        """
+        try:
+            print(f"🤖 Trying model: {model}")
+            
+            response = await client.post(
+                "http://localhost:11434/api/generate",
+                json={
+                    "model": model,
+                    "prompt": prompt,
+                    "stream": False
+                }
+            )
+            
+            if response.status_code != 200:
+                return None
+            
+            title = response.json()['response'].strip()
+            
+            # Check if the model refused to generate content
+            if _REFUSAL_RE.search(title):
+                print(f"⚠️  Model {model} refused to generate title")
+                return None
+            
+            return model, title
+            
+        except Exception as e:
+            print(f"⚠️  Failed with model {model}: {e}")
+            return None
+    
     def extract_first_sentence(self, transcript: str) -> str:
         """
         Extract the first sentence from transcript and clean it up.
@@ -278,6 +604,48 @@ class LocalAudioTranscriber:
         
         return first_sentence
     
+    def _save_title_async(self, filename: str, title: str, transcript: str):
+        """
+        Queue a .title file write on the background I/O executor.
+        
+        Args:
+            filename: Audio filename
+            title: Generated title
+            transcript: Audio transcript
+        """
+        with self._io_lock:
+            future = self._io_executor.submit(self.save_title_to_file, filename, title, transcript)
+            self._pending_io.add(future)
+        future.add_done_callback(lambda done: self._title_write_done(done, filename))
+    
+    def _title_write_done(self, future: concurrent.futures.Future, filename: str):
+        """
+        Drop a finished .title write from the pending set, reporting any error.
+        
+        Args:
+            future: Finished write
+            filename: Audio filename
+        """
+        with self._io_lock:
+            self._pending_io.discard(future)
+        error = future.exception()
+        if error is not None:
+            print(f"⚠️  Failed to save title file for {filename}: {error}")
+    
+    def flush_title_files(self):
+        """
+        Wait for pending background .title file writes to finish.
+        """
+        with self._io_lock:
+            pending = list(self._pending_io)
+        concurrent.futures.wait(pending)
+    
+    def _shutdown_io(self):
+        """
+        Finish pending .title file writes and stop the I/O executor at exit.
+        """
+        self._io_executor.shutdown(wait=True)
+    
     def save_title_to_file(self, filename: str, title: str, transcript: str):
         """
         Save a title to a .title file for potential human editing.
@@ -325,26 +693,76 @@ class LocalAudioTranscriber:
         print(f"\n📄 Processing: {html_file}")
         print("=" * 50)
         
-        urls = self.extract_audio_urls_from_html(html_file)
-        url_to_title = {}
+        return self.process_urls(self.extract_audio_urls_from_html(html_file))
+    
+    def process_urls(self, urls: List[str]) -> Dict[str, str]:
+        """
+        Download, transcribe, and generate titles for a list of audio URLs.
         
-        for url in urls:
-            # Download audio
-            audio_path = self.download_audio_file(url)
-            if not audio_path:
-                continue
-            
-            # Transcribe audio
-            transcript = self.transcribe_audio(audio_path)
-            if not transcript:
-                continue
-            
-            # Generate title
-            title = self.generate_title_from_transcript(transcript, audio_path.name)
-            url_to_title[url] = title
+        Args:
+            urls: Audio file URLs
             
-            print(f"📝 Title: {title}")
-            print("-" * 30)
+        Returns:
+            Dictionary mapping URLs to generated titles
+        """
+        url_to_title = {}
+        
+        # Three pipelined stages connected by bounded queues: downloads (network),
+        # transcription (Whisper releases the GIL, so one thread per worker) and
+        # titles (Ollama), so no stage sits idle waiting on another
+        downloaded = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        transcribed = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        
+        def download_stage():
+            try:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as downloader:
+                    futures = {downloader.submit(self.download_audio_file, url): url for url in urls}
+                    for future in concurrent.futures.as_completed(futures):
+                        audio_path = future.result()
+                        if audio_path:
+                            downloaded.put((futures[future], audio_path))
+            finally:
+                for _ in range(self.max_workers):
+                    downloaded.put(_STAGE_DONE)
+        
+        def transcribe_stage():
+            try:
+                while True:
+                    item = downloaded.get()
+                    if item is _STAGE_DONE:
+                        break
+                    url, audio_path = item
+                    transcript = self.transcribe_audio(audio_path)
+                    if transcript:
+                        transcribed.put((url, audio_path.name, transcript))
+            finally:
+                transcribed.put(_STAGE_DONE)
+        
+        def title_stage():
+            finished = 0
+            while finished < self.max_workers:
+                item = transcribed.get()
+                if item is _STAGE_DONE:
+                    finished += 1
+                    continue
+                url, filename, transcript = item
+                try:
+                    title = self.generate_title_from_transcript(transcript, filename)
+                except Exception as e:
+                    print(f"✗ Failed to generate title for {filename}: {e}")
+                    continue
+                url_to_title[url] = title
+                
+                print(f"📝 Title: {title}")
+                print("-" * 30)
+        
+        threads = [threading.Thread(target=download_stage, daemon=True)]
+        threads += [threading.Thread(target=transcribe_stage, daemon=True) for _ in range(self.max_workers)]
+        threads.append(threading.Thread(target=title_stage, daemon=True))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
         
         return url_to_title
     
@@ -356,6 +774,11 @@ class LocalAudioTranscriber:
             html_file: Path to HTML file
             url_to_title: Dictionary mapping URLs to titles
         """
+        # Nothing to rewrite; skip reading and writing the whole file
+        if not url_to_title:
+            print(f"⏭️  No titles to apply to {html_file}")
+            return
+        
         # Create backup
         backup_file = f"{html_file}.backup"
         if not os.path.exists(backup_file):
@@ -368,19 +791,24 @@ class LocalAudioTranscriber:
         with open(html_file, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Replace titles
-        updated_content = content
-        for url, title in url_to_title.items():
-            # Handle audio tags with source elements
-            # Pattern: <span style="white-space: nowrap;">01<audio controls preload="none"><source src="URL" type="audio/mpeg">
-            pattern = f'<span style="white-space: nowrap;">(\\d+)<audio controls preload="none"><source src="{re.escape(url)}" type="audio/mpeg">'
-            replacement = f'<span style="white-space: nowrap;">\\1. {title}<audio controls preload="none"><source src="{url}" type="audio/mpeg">'
-            updated_content = re.sub(pattern, replacement, updated_content)
-            
-            # Also handle data-audio attributes if they exist
-            pattern = f'data-audio="{re.escape(url)}">[^<]+</li>'
-            replacement = f'data-audio="{url}">{title}</li>'
-            updated_content = re.sub(pattern, replacement, updated_content)
+        # Match only the URLs being titled, in both the numbered audio spans
+        # (<span ...>01<audio ...><source src="URL" ...>) and data-audio list
+        # items, so the whole document is scanned once
+        url_alt = "|".join(re.escape(url) for url in url_to_title)
+        pattern = re.compile(
+            rf'<span style="white-space: nowrap;">(?P<num>\d+)<audio controls preload="none">'
+            rf'<source src="(?P<src>{url_alt})" type="audio/mpeg">'
+            rf'|data-audio="(?P<data>{url_alt})">[^<]+</li>'
+        )
+        
+        def replace_title(match):
+            url = match.group('src')
+            if url is not None:
+                return f'<span style="white-space: nowrap;">{match.group("num")}. {url_to_title[url]}<audio controls preload="none"><source src="{url}" type="audio/mpeg">'
+            url = match.group('data')
+            return f'data-audio="{url}">{url_to_title[url]}</li>'
+        
+        updated_content = pattern.sub(replace_title, content)
         
         # Write updated content
         with open(html_file, 'w', encoding='utf-8') as f:
@@ -402,8 +830,9 @@ class LocalAudioTranscriber:
                 title = self.generate_title_from_transcript(info['transcript'], filename)
                 info['title'] = title
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.transcriptions, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(self.transcriptions,
+                                 option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         print(f"💾 Saved transcriptions summary: {output_file}")
         print(f"📁 Individual transcript files saved in: {self.output_dir}")
@@ -416,16 +845,42 @@ class LocalAudioTranscriber:
             for file in sorted(transcript_files):
                 print(f"   - {file.name}")
     
-    def load_existing_transcriptions(self):
+    def load_existing_transcriptions(self, summary_file: str = "transcriptions.json"):
         """
-        Load existing transcriptions from .txt files in the output directory.
+        Load existing transcriptions from the JSON summary written by
+        save_transcriptions, plus any .txt files in the output directory that
+        the summary doesn't cover or that were rewritten after it was saved
+        (e.g. by an interrupted run).
+        
+        Args:
+            summary_file: JSON summary file path
         """
         print("📂 Loading existing transcriptions...")
         
+        # One open + parse beats opening every .txt file individually
+        summary_mtime = float('inf')
+        try:
+            with open(summary_file, 'r', encoding='utf-8') as f:
+                summary_mtime = os.fstat(f.fileno()).st_mtime
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = None
+        
+        if isinstance(saved, dict):
+            for audio_filename, info in saved.items():
+                if Path(info.get('audio_path', self.output_dir / audio_filename)).exists():
+                    self.transcriptions[audio_filename] = info
+            print(f"✓ Loaded {len(self.transcriptions)} transcriptions from {summary_file}")
+        
+        # The summary is only written at the end of a workflow, so read any
+        # transcript files it doesn't list or that are newer than it
         transcript_files = list(self.output_dir.glob("*.txt"))
         for transcript_file in transcript_files:
             # Get corresponding audio filename
             audio_filename = transcript_file.name.replace('.txt', '.mp3')
+            if (audio_filename in self.transcriptions
+                    and transcript_file.stat().st_mtime <= summary_mtime):
+                continue
             audio_path = self.output_dir / audio_filename
             
             if audio_path.exists():
@@ -455,15 +910,10 @@ class LocalAudioTranscriber:
             print("❌ No transcriptions found. Please run transcription first.")
             return
         
-        # Only process the first HTML file to avoid duplicates
-        html_file = self.html_files[0]  # index.html
-        
-        if os.path.exists(html_file):
-            print(f"📄 Processing: {html_file} (skipping others to avoid duplicates)")
-            url_to_title = self.process_html_file_titles_only(html_file)
-            self.update_html_file(html_file, url_to_title)
-        else:
-            print(f"⚠️  File not found: {html_file}")
+        # Title each audio file once, however many HTML files link to it
+        urls_by_file, urls = self.collect_audio_urls()
+        url_to_title = self.process_urls_titles_only(urls)
+        self.update_html_files(urls_by_file, url_to_title)
         
         # Save transcriptions
         self.save_transcriptions()
@@ -484,7 +934,18 @@ class LocalAudioTranscriber:
         print(f"\n📄 Processing titles for: {html_file}")
         print("=" * 50)
         
-        urls = self.extract_audio_urls_from_html(html_file)
+        return self.process_urls_titles_only(self.extract_audio_urls_from_html(html_file))
+    
+    def process_urls_titles_only(self, urls: List[str]) -> Dict[str, str]:
+        """
+        Generate titles for a list of audio URLs from existing transcriptions.
+        
+        Args:
+            urls: Audio file URLs
+            
+        Returns:
+            Dictionary mapping URLs to generated titles
+        """
         url_to_title = {}
         
         for url in urls:
@@ -511,27 +972,61 @@ class LocalAudioTranscriber:
     
     def run_complete_workflow(self):
         """
-        Run the complete transcription workflow on the first HTML file only.
+        Run the complete transcription workflow across all HTML files.
         """
         print("🎵 Local Audio Transcription Workflow")
         print("=" * 50)
         
-        # Only process the first HTML file to avoid duplicates
-        html_file = self.html_files[0]  # index.html
-        
-        if os.path.exists(html_file):
-            print(f"📄 Processing: {html_file} (skipping others to avoid duplicates)")
-            url_to_title = self.process_html_file(html_file)
-            self.update_html_file(html_file, url_to_title)
-        else:
-            print(f"⚠️  File not found: {html_file}")
+        # Download and transcribe each audio file once, however many HTML
+        # files link to it
+        urls_by_file, urls = self.collect_audio_urls()
+        url_to_title = self.process_urls(urls)
+        self.update_html_files(urls_by_file, url_to_title)
         
         # Save transcriptions
         self.save_transcriptions()
         
         print("\n🎉 Workflow completed!")
         print(f"📊 Processed {len(self.transcriptions)} audio files")
-        print("💡 Note: Only processed index.html to avoid duplicate audio files")
+    
+    def collect_audio_urls(self) -> Tuple[Dict[str, List[str]], List[str]]:
+        """
+        Extract audio URLs from every existing HTML file.
+        
+        Returns:
+            (URLs per HTML file, unique URLs across all files in first-seen order)
+        """
+        urls_by_file = {}
+        for html_file in self.html_files:
+            if os.path.exists(html_file):
+                urls_by_file[html_file] = self.extract_audio_urls_from_html(html_file)
+            else:
+                print(f"⚠️  File not found: {html_file}")
+        
+        urls = list(dict.fromkeys(url for file_urls in urls_by_file.values() for url in file_urls))
+        total = sum(len(file_urls) for file_urls in urls_by_file.values())
+        print(f"📄 Found {len(urls)} unique audio files ({total} links) in {len(urls_by_file)} HTML files")
+        return urls_by_file, urls
+    
+    def update_html_files(self, urls_by_file: Dict[str, List[str]], url_to_title: Dict[str, str]):
+        """
+        Apply titles to every HTML file that links to the titled audio.
+        
+        Args:
+            urls_by_file: URLs per HTML file, from collect_audio_urls
+            url_to_title: Dictionary mapping URLs to titles
+        """
+        for html_file, file_urls in urls_by_file.items():
+            self.update_html_file(html_file, {url: url_to_title[url] for url in file_urls if url in url_to_title})
+    
+    def reload_human_titles(self):
+        """
+        Re-read the .title files, picking up edits made since they were loaded.
+        """
+        human_titles = self.load_human_titles()
+        with self._lock:
+            self._human_titles = human_titles
+            self._titled.clear()
     
     def load_human_titles(self):
         """
@@ -574,11 +1069,24 @@ def main():
                        help='Skip download and transcription, only generate titles')
     parser.add_argument('--full', action='store_true', 
                        help='Run full workflow (download, transcribe, generate titles)')
+    parser.add_argument('--compute-type',
+                       help='CTranslate2 compute type, e.g. int8 or int8_float32 (default: int8)')
+    parser.add_argument('--model-path',
+                       help='Directory of a pre-quantized CTranslate2 Whisper model')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignore cached Ollama titles and always query the model')
+    parser.add_argument('--beam', type=int, default=1,
+                       help='Whisper beam size; use 5 for higher-quality transcripts (default: 1)')
     
     args = parser.parse_args()
     
     # Initialize transcriber
-    transcriber = LocalAudioTranscriber()
+    transcriber = LocalAudioTranscriber(
+        compute_type=args.compute_type,
+        model_path=args.model_path,
+        use_cache=not args.no_cache,
+        beam_size=args.beam
+    )
     
     if args.titles_only:
         # Run titles-only workflow
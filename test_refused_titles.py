@@ -3,7 +3,7 @@
 Test script to handle refused titles.
 """
 
-import json
+import orjson
 from src.randombmir_audio_tools.transcribe_audio_local import LocalAudioTranscriber
 
 def test_refused_title_handling():
@@ -34,6 +34,7 @@ def test_refused_title_handling():
         print("-" * 30)
         
         # Check if a .title file was created
+        transcriber.flush_title_files()
         title_file = transcriber.output_dir / f"{test_file.replace('.mp3', '')}.title"
         if title_file.exists():
             print(f"📝 Title file created: {title_file}")
@@ -42,8 +43,9 @@ def test_refused_title_handling():
             print("✅ Title generated successfully without refusal")
     
     # Save to test JSON
-    with open('test_refused_titles.json', 'w', encoding='utf-8') as f:
-        json.dump(transcriber.transcriptions, f, indent=2, ensure_ascii=False)
+    with open('test_refused_titles.json', 'wb') as f:
+        f.write(orjson.dumps(transcriber.transcriptions,
+                             option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     
     print("💾 Saved test results to test_refused_titles.json")
     print("✅ Test completed!")
@@ -3,7 +3,7 @@
 Test script to generate titles for a few audio files.
 """
 
-import json
+import orjson
 from src.randombmir_audio_tools.transcribe_audio_local import LocalAudioTranscriber
 
 def test_title_generation():
@@ -41,8 +41,9 @@ def test_title_generation():
             print(f"⚠️  No transcription found for: {filename}")
     
     # Save to test JSON
-    with open('test_transcriptions.json', 'w', encoding='utf-8') as f:
-        json.dump(transcriber.transcriptions, f, indent=2, ensure_ascii=False)
+    with open('test_transcriptions.json', 'wb') as f:
+        f.write(orjson.dumps(transcriber.transcriptions,
+                             option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     
     print("💾 Saved test results to test_transcriptions.json")
     print("✅ Test completed!")